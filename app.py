@@ -1,10 +1,14 @@
 # app.py  — unified bot (config + job) with webhook
-import os, json, logging
+import os, asyncio, logging, sqlite3, threading
 from datetime import datetime, date as _date
-from typing import Dict, Any, List
-import pytz
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
+from zoneinfo import ZoneInfo
+import orjson
 import telebot
-import telebot.apihelper as apihelper
+from telebot import asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_filters import SimpleCustomFilter
 from fastapi import FastAPI, Request
 from fastapi.responses import PlainTextResponse, JSONResponse
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -14,53 +18,150 @@ from apscheduler.triggers.cron import CronTrigger
 BOT_TOKEN      = os.environ["BOT_TOKEN"]            # BotFather token (tək bot)
 GROUP_CHAT_ID  = int(os.environ.get("GROUP_CHAT_ID", "0"))  # Qrup id (job mesajları üçün)
 ADMIN_PIN      = os.environ.get("BOT_ADMIN_PIN", "changeme")
-TIMEZONE       = pytz.timezone(os.environ.get("TIMEZONE", "Asia/Baku"))
+TIMEZONE       = ZoneInfo(os.environ.get("TIMEZONE", "Asia/Baku"))
 
 # ======== Paths ========
 BASE_DIR       = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE    = os.path.join(BASE_DIR, "config.json")
-USERS_FILE     = os.path.join(BASE_DIR, "users.json")      # { "Ad": chat_id }
-ANSWERS_FILE   = os.path.join(BASE_DIR, "answers.json")    # { "YYYY-MM-DD": { "Ad": "cavab" } }
+DB_FILE        = os.path.join(BASE_DIR, "scrum.db")        # SQLite: users + answers
+USERS_FILE     = os.path.join(BASE_DIR, "users.json")      # köhnə format, yalnız DB-yə köçürmə üçün
+ANSWERS_FILE   = os.path.join(BASE_DIR, "answers.json")    # köhnə format, yalnız DB-yə köçürmə üçün
 ADMINS_FILE    = os.path.join(BASE_DIR, "admins.json")     # [chat_id, ...]
 
 # ======== Bootstrap & utils ========
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
-apihelper.SESSION_TIME_TO_LIVE = 60
 
 def load_json(path: str, default):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
     except Exception:
         return default
 
+def _dump_json(data) -> bytes:
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
 def save_json(path: str, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _write_bytes(path, _dump_json(data))
+
+def _write_bytes(path: str, raw: bytes):
+    # əvvəl .tmp-yə yazıb fsync edirik, sonra atomik rename: yarımçıq fayl heç vaxt qalmır
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if path == CONFIG_FILE:
+        _CFG_CACHE["mtime"] = None
+
+# config.json-un xam baytları yalnız fayl dəyişəndə yenidən oxunur (st_mtime_ns ilə yoxlanılır).
+# Hər çağırışda orjson.loads təzə dict verir — çağıranlar onu rahat dəyişə bilər (team_add və s.)
+_CFG_CACHE: Dict[str, Any] = {"mtime": None, "raw": None}
 
 def _load_config_or_die() -> Dict[str, Any]:
-    if not os.path.exists(CONFIG_FILE):
+    if _CFG_PENDING is not None:
+        return orjson.loads(_CFG_PENDING)
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
         raise FileNotFoundError(f"{CONFIG_FILE} tapılmadı.")
-    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    if _CFG_CACHE["mtime"] != mtime:
+        with open(CONFIG_FILE, "rb") as f:
+            _CFG_CACHE["raw"] = f.read()
+        _CFG_CACHE["mtime"] = mtime
+    return orjson.loads(_CFG_CACHE["raw"])
+
+# Admin əmrləri config-i ardıcıl dəyişəndə diskə hər dəfə yox, CONFIG_FLUSH_DELAY-dən sonra bir dəfə yazılır
+CONFIG_FLUSH_DELAY = 0.2
+CONFIG_RETRY_DELAY = 5.0   # yazı alınmasa, bu qədər saniyədən sonra yenidən cəhd
+_CFG_WRITE_LOCK = threading.Lock()
+_CFG_PENDING: bytes | None = None   # hələ diskə yazılmamış config (serializə olunmuş)
+_pending_cfg_write: asyncio.TimerHandle | None = None
+
+def save_config(cfg: Dict[str, Any]):
+    global _CFG_PENDING, _pending_cfg_write
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _CFG_PENDING = _dump_json(cfg)
+        _flush_config()
+        return
+    _CFG_PENDING = _dump_json(cfg)
+    _arm_config_flush(loop, CONFIG_FLUSH_DELAY)
+
+def _arm_config_flush(loop: asyncio.AbstractEventLoop, delay: float):
+    global _pending_cfg_write
+    if _pending_cfg_write is not None:
+        _pending_cfg_write.cancel()
+    _pending_cfg_write = loop.call_later(delay, lambda: _schedule(_flush_config_async()))
+
+def _write_config(raw: bytes):
+    with _CFG_WRITE_LOCK:
+        _write_bytes(CONFIG_FILE, raw)
+
+def _config_written(raw: bytes):
+    # yazı gedərkən yeni dəyişiklik gəlibsə, pending qalır — onu növbəti flush yazacaq
+    global _CFG_PENDING
+    if _CFG_PENDING is raw:
+        _CFG_PENDING = None
+
+async def _flush_config_async(raise_errors: bool = False):
+    # fsync event loop-u bloklamasın deyə yazı ayrıca thread-də gedir; _CFG_PENDING yalnız loop-da dəyişir
+    global _pending_cfg_write
+    if _pending_cfg_write is not None:
+        _pending_cfg_write.cancel()
+        _pending_cfg_write = None
+    raw = _CFG_PENDING
+    if raw is None:
+        return
+    try:
+        await asyncio.to_thread(_write_config, raw)
+    except Exception as e:
+        logging.exception("config write error, %ss sonra təkrar: %s", CONFIG_RETRY_DELAY, e)
+        if _CFG_PENDING is raw:
+            _arm_config_flush(asyncio.get_running_loop(), CONFIG_RETRY_DELAY)
+        if raise_errors:
+            raise
+        return
+    _config_written(raw)
 
-def today_str() -> str:
-    return datetime.now(TIMEZONE).strftime("%Y-%m-%d")
+def _flush_config():
+    # sinxron flush: yalnız loop olmayan hallar üçün (save_config loop-suz çağırılanda)
+    raw = _CFG_PENDING
+    if raw is not None:
+        _write_config(raw)
+        _config_written(raw)
 
-def today_weekday() -> int:
-    return datetime.now(TIMEZONE).isoweekday()  # 1=Mon .. 7=Sun
+def _now_local() -> datetime:
+    return datetime.now(TIMEZONE)
 
-def _today_date() -> _date:
-    return datetime.now(TIMEZONE).date()
+# now ötürülərsə, bir handler/job daxilində bütün "bu gün" hesabları eyni an üzrə aparılır
+def today_str(now: datetime | None = None) -> str:
+    return (now or _now_local()).strftime("%Y-%m-%d")
+
+def _today_date(now: datetime | None = None) -> _date:
+    return (now or _now_local()).date()
 
 def _parse_date(s: str) -> _date:
-    return datetime.strptime(s, "%Y-%m-%d").date()
+    return _date.fromisoformat(s)
+
+def _norm_date(s: str) -> str:
+    # fromisoformat "20261001", "2026-W40-4" kimi formaları da qəbul edir — hamısını YYYY-MM-DD-yə gətiririk
+    try:
+        return _parse_date(s).isoformat()
+    except ValueError:
+        return s
+
+def _team_index(team: List[str]) -> Dict[str, str]:
+    # reversed: eyni adın təkrarı olarsa, əvvəlki kimi ilk uyğun gələn qalsın
+    return {t.lower(): t for t in reversed(team)}
 
-def canon_name(raw: str, team: List[str]) -> str | None:
-    for t in team:
-        if t.lower() == raw.lower():
-            return t
-    return None
+def canon_name(raw: str, team: List[str] | None = None) -> str | None:
+    # team verilməyibsə canlı TEAM üçün reload-da qurulmuş TEAM_INDEX işlədilir;
+    # admin əmrləri isə diskdəki/pending config-in TEAM-i ilə yoxlayır
+    index = TEAM_INDEX if team is None else _team_index(team)
+    return index.get(raw.lower())
 
 def parse_hhmm(s: str):
     hh, mm = [int(x) for x in s.split(":")]
@@ -68,60 +169,226 @@ def parse_hhmm(s: str):
         raise ValueError
     return hh, mm
 
+_ADMINS: set[int] = set(load_json(ADMINS_FILE, []))
+
 def is_admin(chat_id: int) -> bool:
-    admins = load_json(ADMINS_FILE, [])
-    return chat_id in admins
+    return chat_id in _ADMINS
 
 def add_admin(chat_id: int):
-    admins = load_json(ADMINS_FILE, [])
-    if chat_id not in admins:
-        admins.append(chat_id)
-        save_json(ADMINS_FILE, admins)
-
-def get_remote_today() -> List[str]:
-    wd = today_weekday()
-    return [
-        name for name, days in WEEKLY_SCHEDULE.items()
-        if wd in days and not is_on_vacation(name)
-    ]
+    if chat_id not in _ADMINS:
+        _ADMINS.add(chat_id)
+        save_json(ADMINS_FILE, sorted(_ADMINS))
+
+# (gün, remote siyahısı) — gün ərzində təkrar hesablanmır, config reload-da sıfırlanır
+_REMOTE_CACHE: Tuple[_date | None, List[str]] = (None, [])
+
+def get_remote_today(today: _date | None = None) -> List[str]:
+    global _REMOTE_CACHE
+    if today is None:
+        today = _today_date()
+    cached_day, remote = _REMOTE_CACHE
+    if cached_day != today:
+        remote = [
+            name for name in WEEKLY_BY_DAY[today.isoweekday() - 1]
+            if not is_on_vacation(name, today)
+        ]
+        _REMOTE_CACHE = (today, remote)
+    return list(remote)
+
+def _parse_vacations(vacations: Dict[str, list]) -> Dict[str, List[Tuple[_date, _date]]]:
+    parsed: Dict[str, List[Tuple[_date, _date]]] = {}
+    for name, ranges in vacations.items():
+        parsed[name] = []
+        for rng in ranges:
+            try:
+                parsed[name].append((_parse_date(rng[0]), _parse_date(rng[1])))
+            except Exception:
+                pass  # səhv formatlı aralıq nəzərə alınmır
+    return parsed
 
 def is_on_vacation(name: str, d: _date | None = None) -> bool:
     if d is None:
         d = _today_date()
-    ranges = VACATIONS.get(name, [])
-    for rng in ranges:
-        try:
-            start, end = _parse_date(rng[0]), _parse_date(rng[1])
-            if start <= d <= end:
-                return True
-        except Exception:
-            pass
-    return False
+    return any(start <= d <= end for start, end in VACATIONS_PARSED.get(name, ()))
 
-def make_scrum_prompt() -> str:
+@lru_cache(maxsize=4)
+def _make_scrum_prompt(hour: int, minute: int) -> str:
     return (
         "Salam! Bu gün remote-san. Xahiş edirəm bu 3 suala qısa cavab yaz:\n"
         "1) Dünən nə etdin?\n"
         "2) Bu gün nə edəcəksən?\n"
         "3) Bloklayan problem varmı?\n"
-        f"Qeyd: Cavabınızı saat {SUMMARY_HOUR:02d}:{SUMMARY_MINUTE:02d}-a kimi göndərin."
+        f"Qeyd: Cavabınızı saat {hour:02d}:{minute:02d}-a kimi göndərin."
     )
 
+def make_scrum_prompt() -> str:
+    return _make_scrum_prompt(SUMMARY_HOUR, SUMMARY_MINUTE)
+
+# ======== Async helpers ========
+MAIN_LOOP: asyncio.AbstractEventLoop | None = None   # on_start-da təyin olunur
+_BACKGROUND_TASKS: set[asyncio.Task] = set()
+
+def _on_task_done(task: asyncio.Task):
+    _BACKGROUND_TASKS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.error("background task error: %r", task.exception(), exc_info=task.exception())
+
+def _schedule(coro):
+    # loop-un içindən task yaradır, başqa thread-dən isə MAIN_LOOP-a ötürür
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if MAIN_LOOP is None:
+            raise RuntimeError("MAIN_LOOP hələ təyin olunmayıb (startup gözlənilir)")
+        return asyncio.run_coroutine_threadsafe(coro, MAIN_LOOP)
+    task = loop.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
+
+# ======== Storage (SQLite) ========
+_DB_LOCK = threading.Lock()
+
+def _open_db() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "date TEXT, name TEXT, text TEXT, PRIMARY KEY (date, name))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS users (name TEXT PRIMARY KEY, chat_id INTEGER)")
+        conn.execute("CREATE INDEX IF NOT EXISTS users_chat_id ON users (chat_id)")
+        _import_legacy_json(conn)
+    return conn
+
+def _import_legacy_json(conn: sqlite3.Connection):
+    # Cədvəl boşdursa köhnə users.json / answers.json-dakı məlumatları bir dəfə köçür
+    if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+        users = load_json(USERS_FILE, {})
+        conn.executemany("INSERT INTO users VALUES (?, ?)", users.items())
+    if conn.execute("SELECT 1 FROM answers LIMIT 1").fetchone() is None:
+        answers = load_json(ANSWERS_FILE, {})
+        conn.executemany(
+            "INSERT INTO answers VALUES (?, ?, ?)",
+            ((day, name, text) for day, by_name in answers.items() for name, text in by_name.items())
+        )
+
+# users cədvəlinin yaddaşdakı surəti (ad -> chat_id, chat_id -> ad); /register-də yenilənir
+_USERS_CACHE: Dict[str, int] = {}
+_USERS_BY_CHAT: Dict[int, str] = {}
+
+def _reload_users_cache():
+    global _USERS_CACHE, _USERS_BY_CHAT
+    with _DB_LOCK:
+        rows = DB.execute("SELECT name, chat_id FROM users ORDER BY rowid").fetchall()
+    by_chat: Dict[int, str] = {}
+    for name, chat_id in rows:
+        by_chat.setdefault(chat_id, name)
+    _USERS_CACHE, _USERS_BY_CHAT = dict(rows), by_chat
+
+def load_users() -> Dict[str, int]:
+    return dict(_USERS_CACHE)
+
+def save_user(name: str, chat_id: int):
+    with _DB_LOCK, DB:
+        DB.execute("INSERT OR REPLACE INTO users VALUES (?, ?)", (name, chat_id))
+    _reload_users_cache()
+
+def user_by_chat_id(chat_id: int) -> str | None:
+    return _USERS_BY_CHAT.get(chat_id)
+
+# Cavablar əvvəl yaddaşa yığılır, fon task-ı ANSWERS_FLUSH_DELAY-dən sonra bir tranzaksiyada yazır
+ANSWERS_FLUSH_DELAY = 0.5
+ANSWERS_RETRY_DELAY = 5.0   # yazı alınmasa, bu qədər saniyədən sonra yenidən cəhd
+_ANSWERS_PENDING: Dict[Tuple[str, str], str] = {}
+_ANSWERS_LOCK = threading.Lock()
+_ANSWERS_WRITE_LOCK = threading.Lock()
+_ANSWERS_DIRTY: asyncio.Event | None = None
+
+def queue_answer(day: str, name: str, text: str):
+    with _ANSWERS_LOCK:
+        _ANSWERS_PENDING[(day, name)] = text
+    if _ANSWERS_DIRTY is None:
+        flush_answers()  # writer hələ başlamayıbsa birbaşa yaz
+    else:
+        _ANSWERS_DIRTY.set()  # handler-lər loop-da işləyir, writer-i birbaşa oyadırıq
+
+def flush_answers():
+    # _ANSWERS_WRITE_LOCK flush-ları ardıcıl edir (köhnə batch yenisini əzməsin);
+    # _ANSWERS_LOCK isə yalnız snapshot anında tutulur ki, loop-dakı queue_answer gözləməsin
+    with _ANSWERS_WRITE_LOCK:
+        with _ANSWERS_LOCK:
+            if not _ANSWERS_PENDING:
+                return
+            pending = dict(_ANSWERS_PENDING)
+            _ANSWERS_PENDING.clear()
+        try:
+            with _DB_LOCK, DB:
+                DB.executemany(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?)",
+                    [(day, name, text) for (day, name), text in pending.items()]
+                )
+        except Exception:
+            # yazılmayan cavabları geri qaytar, amma arada gələn yeniləri əzmə
+            with _ANSWERS_LOCK:
+                for key, text in pending.items():
+                    _ANSWERS_PENDING.setdefault(key, text)
+            raise
+
+async def _answers_writer():
+    while True:
+        await _ANSWERS_DIRTY.wait()
+        await asyncio.sleep(ANSWERS_FLUSH_DELAY)
+        _ANSWERS_DIRTY.clear()
+        try:
+            await asyncio.to_thread(flush_answers)
+        except Exception as e:
+            # cavablar pending-ə qaytarılıb; yeni DM gözləmədən təkrar cəhd et
+            logging.exception("answers flush error, %ss sonra təkrar: %s", ANSWERS_RETRY_DELAY, e)
+            asyncio.get_running_loop().call_later(ANSWERS_RETRY_DELAY, _ANSWERS_DIRTY.set)
+
+def load_answers(day: str) -> Dict[str, str]:
+    with _DB_LOCK:
+        return dict(DB.execute("SELECT name, text FROM answers WHERE date = ? ORDER BY rowid", (day,)))
+
+DB = _open_db()
+_reload_users_cache()
+
 # ======== Load config ========
-CONFIG           = _load_config_or_die()
-TEAM             = CONFIG["TEAM"]
-WEEKLY_SCHEDULE  = CONFIG["WEEKLY_SCHEDULE"]
-VACATIONS        = CONFIG.get("VACITIONS", CONFIG.get("VACATIONS", {}))
-PROMPT_HOUR      = CONFIG["PROMPT_HOUR"]
-PROMPT_MINUTE    = CONFIG["PROMPT_MINUTE"]
-SUMMARY_HOUR     = CONFIG["SUMMARY_HOUR"]
-SUMMARY_MINUTE   = CONFIG["SUMMARY_MINUTE"]
-LIVE_SCRUM_AT    = CONFIG["LIVE_SCRUM_AT"]
-
-TESTERS            = CONFIG.get("TESTERS", [])
-TESTERS_PING_TIMES = CONFIG.get("TESTERS_PING_TIMES", [])
-
-def reschedule_jobs():
+def _reload_config_cache():
+    global CONFIG, TEAM, TEAM_JOINED, TEAM_INDEX, WEEKLY_SCHEDULE, VACATIONS
+    global PROMPT_HOUR, PROMPT_MINUTE, SUMMARY_HOUR, SUMMARY_MINUTE, LIVE_SCRUM_AT
+    global TESTERS, TESTERS_PING_TIMES
+    global WEEKLY_BY_DAY, VACATIONS_PARSED, _REMOTE_CACHE
+
+    CONFIG           = _load_config_or_die()
+    TEAM             = CONFIG["TEAM"]
+    WEEKLY_SCHEDULE  = CONFIG["WEEKLY_SCHEDULE"]
+    VACATIONS        = CONFIG.get("VACITIONS", CONFIG.get("VACATIONS", {}))
+    PROMPT_HOUR      = CONFIG["PROMPT_HOUR"]
+    PROMPT_MINUTE    = CONFIG["PROMPT_MINUTE"]
+    SUMMARY_HOUR     = CONFIG["SUMMARY_HOUR"]
+    SUMMARY_MINUTE   = CONFIG["SUMMARY_MINUTE"]
+    LIVE_SCRUM_AT    = CONFIG["LIVE_SCRUM_AT"]
+
+    TESTERS            = CONFIG.get("TESTERS", [])
+    TESTERS_PING_TIMES = CONFIG.get("TESTERS_PING_TIMES", [])
+
+    # config-dən asılı, tez-tez lazım olan hazır dəyərlər
+    TEAM_JOINED = ", ".join(TEAM)
+    TEAM_INDEX  = _team_index(TEAM)
+    # WEEKLY_BY_DAY[wd - 1] = həmin gün remote olanlar (Mon=1..Sun=7)
+    WEEKLY_BY_DAY    = [[name for name, days in WEEKLY_SCHEDULE.items() if d in days] for d in range(1, 8)]
+    VACATIONS_PARSED = _parse_vacations(VACATIONS)
+    _REMOTE_CACHE = (None, [])
+    _make_scrum_prompt.cache_clear()
+
+_reload_config_cache()
+
+# Job-ları config-ə görə (yenidən) qurur; ən azı bir job varsa True qaytarır
+def reschedule_jobs() -> bool:
     try:
         # Əsas iki job
         scheduler.add_job(
@@ -157,400 +424,418 @@ def reschedule_jobs():
                 replace_existing=True
             )
 
-    except Exception:
-        # burda çox səs-küy olmasın deyə pass edirdin, elə saxladım
-        pass
+    except Exception as e:
+        logging.exception("reschedule_jobs ERROR: %s", e)
+        return False
+    return bool(scheduler.get_jobs())
 
 
 # ======== Bot ========
-bot = telebot.TeleBot(BOT_TOKEN)
+bot = AsyncTeleBot(BOT_TOKEN)   # aiohttp: bir sessiya, keep-alive bağlantılar
+
+async def _args(message, n: int, usage: str) -> Tuple[str, ...] | None:
+    # "/cmd a b c" -> n arqument; çatışmırsa usage cavablanır və None qaytarılır
+    parts = (message.text or "").split(None, n)
+    if len(parts) <= n:
+        await bot.reply_to(message, usage)
+        return None
+    return tuple(p.strip() for p in parts[1:])
 
 # --- COMMON /start, /groupid, /job, /cfg_reload ---
 @bot.message_handler(commands=['start'])
-def cmd_start(message):
+async def cmd_start(message):
     if message.chat.type == "private":
-        bot.reply_to(
+        await bot.reply_to(
             message,
             "Salam! Özünü qeyd etmək üçün /register <Ad> yaz.\n"
-            f"Məsələn: /register Rza\nMövcud adlar: {', '.join(TEAM)}"
+            f"Məsələn: /register Rza\nMövcud adlar: {TEAM_JOINED}"
         )
 
 @bot.message_handler(commands=['groupid'])
-def cmd_groupid(message):
-    bot.reply_to(message, f"Group chat id: {message.chat.id}")
+async def cmd_groupid(message):
+    await bot.reply_to(message, f"Group chat id: {message.chat.id}")
 
 @bot.message_handler(commands=['job'])
-def cmd_job(message):
-    today = today_str()
-    remote = set(get_remote_today())
+async def cmd_job(message):
+    now = _now_local()
+    today, d = today_str(now), _today_date(now)
+    remote = set(get_remote_today(d))
     lines = [f"📅 Bu gün ({today}) iş qrafiki:"]
     for member in TEAM:
-        if is_on_vacation(member):
+        if is_on_vacation(member, d):
             mode = "🌴 Məzuniyyətdə"
         elif member in remote:
             mode = "🏠 Remote"
         else:
             mode = "🏢 Ofisdə"
         lines.append(f"• {member}: {mode}")
-    bot.reply_to(message, "\n".join(lines))
+    await bot.reply_to(message, "\n".join(lines))
 
 @bot.message_handler(commands=['cfg_reload'])
-def cmd_cfg_reload(message):
-    global CONFIG, TEAM, WEEKLY_SCHEDULE, VACATIONS
-    global PROMPT_HOUR, PROMPT_MINUTE, SUMMARY_HOUR, SUMMARY_MINUTE, LIVE_SCRUM_AT
-    global TESTERS, TESTERS_PING_TIMES   # 🔹 əlavə et
-
+async def cmd_cfg_reload(message):
     try:
-        CONFIG           = _load_config_or_die()
-        TEAM             = CONFIG["TEAM"]
-        WEEKLY_SCHEDULE  = CONFIG["WEEKLY_SCHEDULE"]
-        VACATIONS        = CONFIG.get("VACITIONS", CONFIG.get("VACATIONS", {}))
-        PROMPT_HOUR      = CONFIG["PROMPT_HOUR"]
-        PROMPT_MINUTE    = CONFIG["PROMPT_MINUTE"]
-        SUMMARY_HOUR     = CONFIG["SUMMARY_HOUR"]
-        SUMMARY_MINUTE   = CONFIG["SUMMARY_MINUTE"]
-        LIVE_SCRUM_AT    = CONFIG["LIVE_SCRUM_AT"]
-
-        # 🔹 yenilər
-        TESTERS            = CONFIG.get("TESTERS", [])
-        TESTERS_PING_TIMES = CONFIG.get("TESTERS_PING_TIMES", [])
-
-        reschedule_jobs()
-        bot.reply_to(message, "✅ config.json yenidən yükləndi və cədvəllər yeniləndi.")
+        await _flush_config_async(raise_errors=True)
+        _reload_config_cache()
+        if not reschedule_jobs():
+            raise RuntimeError("cədvəl job-ları qurulmadı (log-a bax)")
+        if not scheduler.running:
+            scheduler.start()
+        await bot.reply_to(message, "✅ config.json yenidən yükləndi və cədvəllər yeniləndi.")
     except Exception as e:
-        bot.reply_to(message, f"❌ Yükləmə alınmadı: {e}")
+        await bot.reply_to(message, f"❌ Yükləmə alınmadı: {e}")
 
 
 # --- REGISTER (DM) ---
 @bot.message_handler(commands=['register'])
-def cmd_register(message):
+async def cmd_register(message):
     if message.chat.type != "private":
         return
-    parts = message.text.split(maxsplit=1)
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /register <Ad>\nMəs: /register Rza")
+    args = await _args(message, 1, "İstifadə: /register <Ad>\nMəs: /register Rza")
+    if not args:
         return
-    raw = parts[1].strip()
-    canon = canon_name(raw, TEAM)
+    raw, = args
+    canon = canon_name(raw)
     if not canon:
-        bot.reply_to(message, f"'{raw}' komandada tapılmadı. Mövcud adlar: {', '.join(TEAM)}")
+        await bot.reply_to(message, f"'{raw}' komandada tapılmadı. Mövcud adlar: {TEAM_JOINED}")
         return
-    users = load_json(USERS_FILE, {})
-    users[canon] = message.chat.id
-    save_json(USERS_FILE, users)
-    bot.send_message(message.chat.id, f"Qeyd olundu ✅  {canon} → chat_id: {message.chat.id}")
+    # _DB_LOCK answers flush-u ilə paylaşılır — loop gözləməsin deyə ayrıca thread-də
+    await asyncio.to_thread(save_user, canon, message.chat.id)
+    await bot.send_message(message.chat.id, f"Qeyd olundu ✅  {canon} → chat_id: {message.chat.id}")
 
 # --- OPTIONAL: whoami (diagnostics). İstəsən silə bilərsən.
 @bot.message_handler(commands=['whoami'])
-def cmd_whoami(message):
-    bot.reply_to(message, f"chat_id: {message.chat.id}")
+async def cmd_whoami(message):
+    await bot.reply_to(message, f"chat_id: {message.chat.id}")
 
 # --- DM text = cavabların toplanması (komanda olmayan mətnlər) ---
-@bot.message_handler(
-    func=lambda m: m.chat.type == "private" and not (m.text or "").startswith("/"),
-    content_types=['text']
-)
-def handle_private_text(message):
-    users = load_json(USERS_FILE, {})
-    name = next((k for k, v in users.items() if v == message.chat.id), None)
+class PrivateTextFilter(SimpleCustomFilter):
+    # DM-də gələn, komanda olmayan mətn
+    key = 'private_text'
+
+    async def check(self, message):
+        return message.chat.type == "private" and (message.text or "")[:1] != "/"
+
+bot.add_custom_filter(PrivateTextFilter())
+
+@bot.message_handler(private_text=True, content_types=['text'])
+async def handle_private_text(message):
+    name = user_by_chat_id(message.chat.id)
     if not name:
-        bot.reply_to(message, "Zəhmət olmasa əvvəlcə /register <Ad> ilə qeydiyyatdan keç.")
+        await bot.reply_to(message, "Zəhmət olmasa əvvəlcə /register <Ad> ilə qeydiyyatdan keç.")
         return
 
-    bot.reply_to(
+    now = _now_local()
+    await bot.reply_to(
         message,
-        "Təşəkkürlər! Cavabını qeyd etdim. ✅" if name in get_remote_today()
+        "Təşəkkürlər! Cavabını qeyd etdim. ✅" if name in get_remote_today(_today_date(now))
         else "Qeyd edildi. (Qeyd: bu gün remote siyahısında deyilsən.)"
     )
 
-    answers = load_json(ANSWERS_FILE, {})
-    today = today_str()
-    answers.setdefault(today, {})
-    answers[today][name] = (message.text or "").strip()
-    save_json(ANSWERS_FILE, answers)
+    queue_answer(today_str(now), name, (message.text or "").strip())
 
 # ======== CONFIG COMMANDS (admin PIN) ========
 def admin_only(fn):
-    def wrapper(message, *a, **kw):
+    async def wrapper(message, *a, **kw):
         if message.chat.type != "private":
             return
         if not is_admin(message.chat.id):
-            bot.reply_to(message, "Bu əmri yerinə yetirmək üçün admin olmalısan. /auth <PIN>")
+            await bot.reply_to(message, "Bu əmri yerinə yetirmək üçün admin olmalısan. /auth <PIN>")
             return
-        return fn(message, *a, **kw)
+        return await fn(message, *a, **kw)
     return wrapper
 
 @bot.message_handler(commands=['auth'])
-def cmd_auth(message):
+async def cmd_auth(message):
     if message.chat.type != "private":
         return
-    parts = message.text.split(maxsplit=1)
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /auth <PIN>")
+    args = await _args(message, 1, "İstifadə: /auth <PIN>")
+    if not args:
         return
-    if parts[1].strip() == ADMIN_PIN:
+    if args[0] == ADMIN_PIN:
         add_admin(message.chat.id)
-        bot.reply_to(message, "✅ Admin təsdiqləndi.")
+        await bot.reply_to(message, "✅ Admin təsdiqləndi.")
     else:
-        bot.reply_to(message, "❌ Yanlış PIN.")
+        await bot.reply_to(message, "❌ Yanlış PIN.")
+
+CFG_SHOW_CHUNK_LIMIT = 3500   # Telegram mesaj limiti 4096-dır, ``` üçün yer saxlanılır
+
+def _pretty_json(obj) -> str:
+    # Səliqəli multi-line JSON (orjson həmişə UTF-8 yazır — Azərbaycan hərfləri olduğu kimi qalır)
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+def _split_text(text: str, limit: int) -> List[str]:
+    # Son çarə: bölünə bilməyən böyük dəyər (uzun string, tək elementli konteyner) sətir-sətir,
+    # lazım gəlsə sətrin ortasından kəsilir — heç bir mesaj limiti keçməsin
+    pieces: List[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        if len(current) + len(line) > limit and len(line) <= limit:
+            pieces.append(current)
+            current = ""
+        while len(current) + len(line) > limit:
+            room = limit - len(current)
+            pieces.append(current + line[:room])
+            current, line = "", line[room:]
+        current += line
+    if current:
+        pieces.append(current)
+    return [p.rstrip("\n") for p in pieces]
+
+def _json_chunks(cfg: Dict[str, Any], limit: int = CFG_SHOW_CHUNK_LIMIT) -> List[str]:
+    # Hər parça özü etibarlı JSON-dur: top-level açarlar limitə sığana qədər bir mesajda yığılır
+    chunks: List[str] = []
+    group: Dict[str, Any] = {}
+    for key, value in cfg.items():
+        if group and len(_pretty_json({**group, key: value})) > limit:
+            chunks.append(_pretty_json(group))
+            group = {}
+        if len(_pretty_json({key: value})) > limit and isinstance(value, (dict, list)) and len(value) > 1:
+            # tək açar da sığmırsa, dəyərini yarıya bölüb ayrı-ayrı göndər
+            items = list(value.items()) if isinstance(value, dict) else value
+            half = len(items) // 2
+            for part in (items[:half], items[half:]):
+                chunks.extend(_json_chunks({key: dict(part) if isinstance(value, dict) else part}, limit))
+            continue
+        group[key] = value
+    if group:
+        chunks.append(_pretty_json(group))
+    return [piece for chunk in chunks for piece in (_split_text(chunk, limit) if len(chunk) > limit else [chunk])]
 
 @bot.message_handler(commands=['cfg_show'])
 @admin_only
-def cmd_cfg_show(message):
+async def cmd_cfg_show(message):
     try:
         cfg = _load_config_or_die()
-
-        # Səliqəli multi-line JSON
-        text = json.dumps(
-            cfg,
-            ensure_ascii=False,   # Azərbaycan hərfləri üçün
-            indent=2              # hər səviyyədə 2 boşluq
-        )
-
-        pretty = f"```json\n{text}\n```"
-
-        # Config böyük deyil, limitə girmir, ona görə parçalamasız göndəririk
-        bot.reply_to(message, pretty, parse_mode="Markdown")
+        for chunk in _json_chunks(cfg):
+            await bot.reply_to(message, f"```json\n{chunk}\n```", parse_mode="Markdown")
 
     except Exception as e:
-        bot.reply_to(message, f"❌ Xəta: {e}")
+        await bot.reply_to(message, f"❌ Xəta: {e}")
 
 
 
 @bot.message_handler(commands=['team_list'])
 @admin_only
-def cmd_team_list(message):
+async def cmd_team_list(message):
     cfg = _load_config_or_die()
     team = cfg.get("TEAM", [])
-    bot.reply_to(message, ("👥 TEAM:\n- " + "\n- ".join(team)) if team else "TEAM boşdur.")
+    await bot.reply_to(message, ("👥 TEAM:\n- " + "\n- ".join(team)) if team else "TEAM boşdur.")
 
 @bot.message_handler(commands=['team_add'])
 @admin_only
-def cmd_team_add(message):
-    parts = message.text.split(maxsplit=1)
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /team_add <Ad>")
+async def cmd_team_add(message):
+    args = await _args(message, 1, "İstifadə: /team_add <Ad>")
+    if not args:
         return
-    name = parts[1].strip()
+    name, = args
     cfg = _load_config_or_die()
     team = cfg.get("TEAM", [])
     if canon_name(name, team):
-        bot.reply_to(message, f"'{name}' artıq TEAM-də var.")
+        await bot.reply_to(message, f"'{name}' artıq TEAM-də var.")
         return
     team.append(name); cfg["TEAM"] = team
     ws = cfg.get("WEEKLY_SCHEDULE", {}); ws.setdefault(name, []); cfg["WEEKLY_SCHEDULE"] = ws
     vac = cfg.get("VACATIONS", {});      vac.setdefault(name, []); cfg["VACATIONS"] = vac
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"✅ '{name}' TEAM-ə əlavə edildi.")
+    save_config(cfg)
+    await bot.reply_to(message, f"✅ '{name}' TEAM-ə əlavə edildi.")
 
 @bot.message_handler(commands=['team_rm'])
 @admin_only
-def cmd_team_rm(message):
-    parts = message.text.split(maxsplit=1)
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /team_rm <Ad>")
+async def cmd_team_rm(message):
+    args = await _args(message, 1, "İstifadə: /team_rm <Ad>")
+    if not args:
         return
-    raw = parts[1].strip()
+    raw, = args
     cfg = _load_config_or_die()
     team = cfg.get("TEAM", [])
     name = canon_name(raw, team)
     if not name:
-        bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+        await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
         return
     cfg["TEAM"] = [t for t in team if t != name]
     ws = cfg.get("WEEKLY_SCHEDULE", {}); ws.pop(name, None); cfg["WEEKLY_SCHEDULE"] = ws
     vac = cfg.get("VACATIONS", {});      vac.pop(name, None); cfg["VACATIONS"] = vac
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"✅ '{name}' TEAM-dən silindi.")
+    save_config(cfg)
+    await bot.reply_to(message, f"✅ '{name}' TEAM-dən silindi.")
 
 @bot.message_handler(commands=['sched_show'])
 @admin_only
-def cmd_sched_show(message):
+async def cmd_sched_show(message):
     parts = message.text.split(maxsplit=1)
     cfg = _load_config_or_die()
     ws = cfg.get("WEEKLY_SCHEDULE", {})
     if len(parts) == 1:
         if not ws:
-            bot.reply_to(message, "WEEKLY_SCHEDULE boşdur.")
+            await bot.reply_to(message, "WEEKLY_SCHEDULE boşdur.")
             return
         lines = ["📅 WEEKLY_SCHEDULE:"] + [f"- {k}: {ws[k]}" for k in ws]
-        bot.reply_to(message, "\n".join(lines))
+        await bot.reply_to(message, "\n".join(lines))
     else:
         raw = parts[1].strip()
         name = canon_name(raw, cfg.get("TEAM", []))
         if not name:
-            bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+            await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
             return
         days = ws.get(name, [])
-        bot.reply_to(message, f"{name}: {days if days else '—'}")
+        await bot.reply_to(message, f"{name}: {days if days else '—'}")
 
 @bot.message_handler(commands=['sched_set'])
 @admin_only
-def cmd_sched_set(message):
-    parts = message.text.split(maxsplit=2)
-    if len(parts) < 3:
-        bot.reply_to(message, "İstifadə: /sched_set <Ad> <günlər>  (Mon=1..Sun=7, misal: 1,3,5)")
+async def cmd_sched_set(message):
+    args = await _args(message, 2, "İstifadə: /sched_set <Ad> <günlər>  (Mon=1..Sun=7, misal: 1,3,5)")
+    if not args:
         return
-    raw = parts[1].strip()
+    raw, days_raw = args
     try:
-        days = [int(x) for x in parts[2].replace(" ", "").split(",") if x]
+        days = [int(x) for x in days_raw.replace(" ", "").split(",") if x]
         if any(d < 1 or d > 7 for d in days):
             raise ValueError
     except Exception:
-        bot.reply_to(message, "Günlər 1..7 aralığında olmalıdır. Misal: 1,3,5")
+        await bot.reply_to(message, "Günlər 1..7 aralığında olmalıdır. Misal: 1,3,5")
         return
     cfg = _load_config_or_die()
     name = canon_name(raw, cfg.get("TEAM", []))
     if not name:
-        bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+        await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
         return
     ws = cfg.get("WEEKLY_SCHEDULE", {}); ws[name] = days; cfg["WEEKLY_SCHEDULE"] = ws
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"✅ {name} üçün günlər təyin edildi: {days}")
+    save_config(cfg)
+    await bot.reply_to(message, f"✅ {name} üçün günlər təyin edildi: {days}")
 
 @bot.message_handler(commands=['vac_show'])
 @admin_only
-def cmd_vac_show(message):
+async def cmd_vac_show(message):
     parts = message.text.split(maxsplit=1)
     cfg = _load_config_or_die(); vac = cfg.get("VACATIONS", {})
     if len(parts) == 1:
         if not vac:
-            bot.reply_to(message, "VACATIONS boşdur.")
+            await bot.reply_to(message, "VACATIONS boşdur.")
             return
         lines = ["🌴 VACATIONS:"] + [f"- {k}: {vac[k]}" for k in vac]
-        bot.reply_to(message, "\n".join(lines))
+        await bot.reply_to(message, "\n".join(lines))
     else:
         raw = parts[1].strip()
         name = canon_name(raw, cfg.get("TEAM", []))
         if not name:
-            bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+            await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
             return
-        bot.reply_to(message, f"{name}: {vac.get(name, []) or '—'}")
+        await bot.reply_to(message, f"{name}: {vac.get(name, []) or '—'}")
 
 @bot.message_handler(commands=['vac_add'])
 @admin_only
-def cmd_vac_add(message):
-    parts = message.text.split(maxsplit=3)
-    if len(parts) < 4:
-        bot.reply_to(message, "İstifadə: /vac_add <Ad> <YYYY-MM-DD> <YYYY-MM-DD>")
+async def cmd_vac_add(message):
+    args = await _args(message, 3, "İstifadə: /vac_add <Ad> <YYYY-MM-DD> <YYYY-MM-DD>")
+    if not args:
         return
-    raw, a, b = parts[1].strip(), parts[2].strip(), parts[3].strip()
-    _parse_date(a); _parse_date(b)  # validate
+    raw, a, b = args
+    a, b = _parse_date(a).isoformat(), _parse_date(b).isoformat()  # validate + normalize
     cfg = _load_config_or_die()
     name = canon_name(raw, cfg.get("TEAM", []))
     if not name:
-        bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+        await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
         return
     vac = cfg.get("VACATIONS", {}); vac.setdefault(name, []).append([a, b]); cfg["VACATIONS"] = vac
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"✅ {name}: {a} → {b} əlavə edildi.")
+    save_config(cfg)
+    await bot.reply_to(message, f"✅ {name}: {a} → {b} əlavə edildi.")
 
 @bot.message_handler(commands=['vac_rm'])
 @admin_only
-def cmd_vac_rm(message):
-    parts = message.text.split(maxsplit=3)
-    if len(parts) < 4:
-        bot.reply_to(message, "İstifadə: /vac_rm <Ad> <YYYY-MM-DD> <YYYY-MM-DD>")
+async def cmd_vac_rm(message):
+    args = await _args(message, 3, "İstifadə: /vac_rm <Ad> <YYYY-MM-DD> <YYYY-MM-DD>")
+    if not args:
         return
-    raw, a, b = parts[1].strip(), parts[2].strip(), parts[3].strip()
+    raw, a, b = args
+    a, b = _norm_date(a), _norm_date(b)
     cfg = _load_config_or_die()
     name = canon_name(raw, cfg.get("TEAM", []))
     if not name:
-        bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
+        await bot.reply_to(message, f"'{raw}' TEAM-də tapılmadı.")
         return
     vac = cfg.get("VACATIONS", {})
-    vac[name] = [rng for rng in vac.get(name, []) if rng != [a, b]]
+    vac[name] = [rng for rng in vac.get(name, []) if [_norm_date(x) for x in rng] != [a, b]]
     cfg["VACATIONS"] = vac
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"✅ {name}: {a} → {b} silindi.")
+    save_config(cfg)
+    await bot.reply_to(message, f"✅ {name}: {a} → {b} silindi.")
 
 @bot.message_handler(commands=['prompt'])
 @admin_only
-def cmd_prompt(message):
-    parts = message.text.split(maxsplit=1)
-
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /prompt HH:MM\nNümunə: /prompt 09:15")
+async def cmd_prompt(message):
+    args = await _args(message, 1, "İstifadə: /prompt HH:MM\nNümunə: /prompt 09:15")
+    if not args:
         return
 
-    tm = parts[1].strip()
+    tm, = args
     try:
         hh, mm = tm.split(":")
         hh = int(hh); mm = int(mm)
     except:
-        bot.reply_to(message, f"❗ Yanlış vaxt formatı: `{tm}`. Düz format: HH:MM")
+        await bot.reply_to(message, f"❗ Yanlış vaxt formatı: `{tm}`. Düz format: HH:MM")
         return
 
     cfg = _load_config_or_die()
     cfg["PROMPT_HOUR"] = hh
     cfg["PROMPT_MINUTE"] = mm
 
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"⏰ Prompt vaxtı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz ki, dərhal tətbiq olunsun.")
+    save_config(cfg)
+    await bot.reply_to(message, f"⏰ Prompt vaxtı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz ki, dərhal tətbiq olunsun.")
 
 @bot.message_handler(commands=['summary'])
 @admin_only
-def cmd_summary(message):
-    parts = message.text.split(maxsplit=1)
-
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /summary HH:MM\nNümunə: /summary 17:00")
+async def cmd_summary(message):
+    args = await _args(message, 1, "İstifadə: /summary HH:MM\nNümunə: /summary 17:00")
+    if not args:
         return
 
-    tm = parts[1].strip()
+    tm, = args
     try:
         hh, mm = tm.split(":")
         hh = int(hh); mm = int(mm)
     except:
-        bot.reply_to(message, f"❗ Yanlış format: `{tm}`. Düz format: HH:MM")
+        await bot.reply_to(message, f"❗ Yanlış format: `{tm}`. Düz format: HH:MM")
         return
 
     cfg = _load_config_or_die()
     cfg["SUMMARY_HOUR"] = hh
     cfg["SUMMARY_MINUTE"] = mm
 
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"📌 Summary vaxtı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz.")
+    save_config(cfg)
+    await bot.reply_to(message, f"📌 Summary vaxtı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz.")
 
 @bot.message_handler(commands=['live'])
 @admin_only
-def cmd_live(message):
-    parts = message.text.split(maxsplit=1)
-
-    if len(parts) < 2:
-        bot.reply_to(message, "İstifadə: /live HH:MM\nNümunə: /live 09:40")
+async def cmd_live(message):
+    args = await _args(message, 1, "İstifadə: /live HH:MM\nNümunə: /live 09:40")
+    if not args:
         return
 
-    tm = parts[1].strip()
+    tm, = args
     try:
         hh, mm = tm.split(":")
         hh = int(hh); mm = int(mm)
     except:
-        bot.reply_to(message, f"❗ Yanlış format: `{tm}`. Düz format: HH:MM")
+        await bot.reply_to(message, f"❗ Yanlış format: `{tm}`. Düz format: HH:MM")
         return
 
     cfg = _load_config_or_die()
     cfg["LIVE_SCRUM_AT"] = f"{hh}:{mm}"
 
-    save_json(CONFIG_FILE, cfg)
-    bot.reply_to(message, f"🎥 Canlı scrum saatı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz.")
+    save_config(cfg)
+    await bot.reply_to(message, f"🎥 Canlı scrum saatı yeniləndi: {hh:02d}:{mm:02d}\n💡 /cfg_reload yaz.")
 
 
 @bot.message_handler(commands=['testping'])
 @admin_only
-def cmd_testping(message):
-    parts = message.text.split(maxsplit=1)
-
-    if len(parts) < 2:
-        bot.reply_to(
-            message,
-            "İstifadə: /testping HH:MM[,HH:MM,...]\n"
-            "Nümunə: /testping 11:00,17:30"
-        )
+async def cmd_testping(message):
+    args = await _args(
+        message, 1,
+        "İstifadə: /testping HH:MM[,HH:MM,...]\n"
+        "Nümunə: /testping 11:00,17:30"
+    )
+    if not args:
         return
 
     # Mətni təmizlə (boşluqları sil)
-    raw = parts[1].replace(" ", "")
+    raw = args[0].replace(" ", "")
     times = raw.split(",")
 
     # Validasiya
@@ -559,7 +844,7 @@ def cmd_testping(message):
             hh, mm = t.split(":")
             int(hh); int(mm)  # int çevirmə ilə yoxlayır
         except Exception:
-            bot.reply_to(message, f"❗ Yanlış vaxt formatı: `{t}`. Düz format: HH:MM")
+            await bot.reply_to(message, f"❗ Yanlış vaxt formatı: `{t}`. Düz format: HH:MM")
             return
 
     # Config-i yüklə
@@ -567,9 +852,9 @@ def cmd_testping(message):
     cfg["TESTERS_PING_TIMES"] = times
 
     # Config-i saxla (mövcud mexanizmlə)
-    save_json(CONFIG_FILE, cfg)
+    save_config(cfg)
 
-    bot.reply_to(
+    await bot.reply_to(
         message,
         "✅ Tester ping saatları yeniləndi: " + ", ".join(times) +
         "\n💡 Dərhal effekt verməsi üçün: `/cfg_reload` yaz."
@@ -578,33 +863,42 @@ def cmd_testping(message):
 
 
 # ======== Scheduled jobs (prompt & summary) ========
-def job_send_prompts():
-    users = load_json(USERS_FILE, {})
-    active_team  = [m for m in TEAM if not is_on_vacation(m)]
-    remote_today = [m for m in get_remote_today() if m in active_team]
+PROMPT_SEND_CONCURRENCY = 8
+
+async def job_send_prompts():
+    users = load_users()
+    today = _today_date()
+    active_team  = [m for m in TEAM if not is_on_vacation(m, today)]
+    remote_today = [m for m in get_remote_today(today) if m in active_team]
     non_remote   = [m for m in active_team if m not in remote_today]
-    sent = []
-    for name in remote_today:
+
+    limit = asyncio.Semaphore(PROMPT_SEND_CONCURRENCY)
+
+    async def _send_one(name):
         chat_id = users.get(name)
-        if chat_id:
-            try:
-                bot.send_message(chat_id, make_scrum_prompt())
-                sent.append(name)
-            except Exception as e:
-                logging.exception("DM send error for %s: %s", name, e)
+        if not chat_id:
+            return name, False
+        try:
+            async with limit:
+                await bot.send_message(chat_id, make_scrum_prompt())
+            return name, True
+        except Exception as e:
+            logging.exception("DM send error for %s: %s", name, e)
+            return name, False
+
+    # DM-lər paralel göndərilir: ümumi vaxt komandanın ölçüsündən asılı olmasın
+    results = await asyncio.gather(*(_send_one(name) for name in remote_today))
+    sent = [name for name, ok in results if ok]
     if GROUP_CHAT_ID:
-        bot.send_message(
-            GROUP_CHAT_ID,
+        group_lines = [
             f"🕘 Remote olanlara scrum sorğusu göndərildi: {', '.join(sent)}" if sent
             else "🕘 Bu gün remote siyahısı boşdur (scrum sorğusu göndərilmədi)."
-        )
+        ]
         if non_remote:
-            bot.send_message(
-                GROUP_CHAT_ID,
-                f"📣 Remote olmayanlar üçün {LIVE_SCRUM_AT}-də live scrum: {', '.join(non_remote)}"
-            )
+            group_lines.append(f"📣 Remote olmayanlar üçün {LIVE_SCRUM_AT}-də live scrum: {', '.join(non_remote)}")
+        await bot.send_message(GROUP_CHAT_ID, "\n\n".join(group_lines))
 
-def job_testers_ping():
+async def job_testers_ping():
     # Qrup konfiq olunmayıbsa / tester siyahısı boşdursa, heç nə etmə
     if not GROUP_CHAT_ID or not TESTERS:
         return
@@ -613,37 +907,62 @@ def job_testers_ping():
     text = f"{names}, zəhmət olmasa test etdiyiniz taskların cari statuslarını qeyd edin."
 
     try:
-        bot.send_message(GROUP_CHAT_ID, text)
+        await bot.send_message(GROUP_CHAT_ID, text)
     except Exception as e:
         logging.exception("job_testers_ping ERROR: %s", e)
 
 
-def job_post_summary():
-    answers = load_json(ANSWERS_FILE, {})
+async def job_post_summary():
     today = today_str()
-    day_answers = answers.get(today, {})
+    # SQLite işi loop-u bloklamasın deyə ayrıca thread-də
+    try:
+        await asyncio.to_thread(flush_answers)
+    except Exception as e:
+        # bufer yazılmasa da, DB-də olanlarla summary yenə göndərilsin
+        logging.exception("job_post_summary flush ERROR: %s", e)
+    day_answers = await asyncio.to_thread(load_answers, today)
     if GROUP_CHAT_ID:
         if day_answers:
             lines = [f"📋 {today} — Scrum cavabları:"]
             for k, v in day_answers.items():
                 lines.append(f"• {k}: {v}")
-            bot.send_message(GROUP_CHAT_ID, "\n".join(lines))
+            await bot.send_message(GROUP_CHAT_ID, "\n".join(lines))
         else:
-            bot.send_message(GROUP_CHAT_ID, f"📋 {today} üçün cavab yoxdur.")
+            await bot.send_message(GROUP_CHAT_ID, f"📋 {today} üçün cavab yoxdur.")
 
 # ======== FastAPI + webhook ========
 app = FastAPI()
-scheduler = AsyncIOScheduler(timezone=TIMEZONE)
+# coalesce: gecikmiş (misfire) icralar bir dəfəyə yığılır, restartdan sonra təkrar mesaj getmir
+scheduler = AsyncIOScheduler(
+    timezone=TIMEZONE,
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 300},
+)
 
 @app.on_event("startup")
 async def on_start():
-    reschedule_jobs()
+    global MAIN_LOOP, _ANSWERS_DIRTY
+    MAIN_LOOP = asyncio.get_running_loop()
+    _ANSWERS_DIRTY = asyncio.Event()
+    _schedule(_answers_writer())
+
+    if not reschedule_jobs():
+        logging.error("Scheduler başladılmadı: heç bir job qurulmayıb")
+        return
     scheduler.start()
 
+@app.on_event("shutdown")
+async def on_stop():
+    await _flush_config_async()
+    flush_answers()
+    # heç bir Telegram sorğusu getməyibsə sessiya yaradılmayıb, close_session None.close() edir
+    if asyncio_helper.session_manager.session is not None:
+        await bot.close_session()
+
 @app.post("/hook")
 async def hook(request: Request):
     update = await request.json()
-    bot.process_new_updates([telebot.types.Update.de_json(update)])
+    # Telegram-a dərhal "ok" qaytarırıq, handler-lər fon task-ında işləyir
+    _schedule(bot.process_new_updates([telebot.types.Update.de_json(update)]))
     return PlainTextResponse("ok")
 
 @app.get("/health")
@@ -653,22 +972,22 @@ async def health():
 # (Opsional) Platforma cron istifadə edəcəksə bu URL-ləri vura bilər:
 @app.get("/cron/prompt")
 async def cron_prompt():
-    job_send_prompts()
+    await job_send_prompts()
     return JSONResponse({"status": "prompt_sent"})
 
 @app.get("/cron/summary")
 async def cron_summary():
-    job_post_summary()
+    await job_post_summary()
     return JSONResponse({"status": "summary_posted"})
 from datetime import timezone as _tz
 
 @bot.message_handler(commands=['sched_info'])
 @admin_only
-def cmd_sched_info(message):
+async def cmd_sched_info(message):
     try:
         jobs = scheduler.get_jobs()
         if not jobs:
-            bot.reply_to(message, "🕓 APScheduler: heç bir iş tapılmadı. (Ola bilər ki, Cron Job istifadə olunur və ya scheduler start olmayıb.)")
+            await bot.reply_to(message, "🕓 APScheduler: heç bir iş tapılmadı. (Ola bilər ki, Cron Job istifadə olunur və ya scheduler start olmayıb.)")
             return
         lines = ["🕓 APScheduler aktivdir. Mövcud işlər:"]
         for j in jobs:
@@ -678,9 +997,9 @@ def cmd_sched_info(message):
             else:
                 nrt_local = "—"
             lines.append(f"• {j.id}: növbəti icra = {nrt_local}")
-        bot.reply_to(message, "\n".join(lines))
+        await bot.reply_to(message, "\n".join(lines))
     except Exception as e:
-        bot.reply_to(message, f"❌ Xəta: {e}")
+        await bot.reply_to(message, f"❌ Xəta: {e}")
 
 # --- HELP (ümumi) ---
 USER_HELP_TEXT = (
@@ -692,8 +1011,8 @@ USER_HELP_TEXT = (
 )
 
 @bot.message_handler(commands=['help'])
-def cmd_help(message):
-    bot.reply_to(message, USER_HELP_TEXT)
+async def cmd_help(message):
+    await bot.reply_to(message, USER_HELP_TEXT)
 
 ADMIN_HELP_TEXT = (
     "Salam! Bu botla config.json-u redaktə edə bilərsən (yalnız DM).\n"
@@ -727,12 +1046,12 @@ ADMIN_HELP_TEXT = (
 )
 
 @bot.message_handler(commands=['admin_help', 'help_admin'])
-def cmd_admin_help(message):
+async def cmd_admin_help(message):
     # yalnız DM-də göstər
     if message.chat.type != "private":
         return
     # yalnız admin görə bilsin
     if not is_admin(message.chat.id):
-        bot.reply_to(message, "Bu siyahı üçün admin olmalısan. /auth <PIN>")
+        await bot.reply_to(message, "Bu siyahı üçün admin olmalısan. /auth <PIN>")
         return
-    bot.reply_to(message, ADMIN_HELP_TEXT)
+    await bot.reply_to(message, ADMIN_HELP_TEXT)